@@ -180,8 +180,23 @@ CORS_ALLOW_ALL_ORIGINS = True
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
-    ]
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'documents_api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
 # LLM API settings
 GOOGLE_API_KEY = os.environ.get('GOOGLE_API_KEY', '')
+
+# Validation settings
+# Compile user-supplied validation rule patterns with RE2's linear-time
+# engine (requires the optional google-re2 package) to guard against
+# catastrophic backtracking on adversarial patterns.
+DOCUFLOW_USE_RE2 = os.environ.get('DOCUFLOW_USE_RE2', 'False') == 'True'
+
+# Workflow settings
+# Re-enable the artificial asyncio.sleep delays in the simulated
+# processing paths (useful for demoing progress in the UI).
+WORKFLOW_SIMULATE_LATENCY = os.environ.get('WORKFLOW_SIMULATE_LATENCY', 'False') == 'True'
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class DocumentsApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'documents_api'
+
+    def ready(self):
+        # Build and compile the URLconf eagerly so the first request per
+        # worker does not pay for RoutePattern compilation and the reverse
+        # dictionary population.
+        from django.urls import get_resolver
+
+        resolver = get_resolver()
+        resolver.url_patterns
+        resolver._populate()
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents_api', '0008_make_workflow_step_optional'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workflowexecution',
+            name='step_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -14,6 +14,7 @@ class Document(models.Model):
     extracted_data = models.JSONField(null=True, blank=True)
     summary = models.TextField(null=True, blank=True)
     sentiment = models.CharField(max_length=20, null=True, blank=True)
+    content_hash = models.CharField(max_length=64, null=True, blank=True, db_index=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     
     # Add workflow status tracking
@@ -277,6 +278,7 @@ class WorkflowExecution(models.Model):
     # Execution details
     started_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    step_started_at = models.DateTimeField(null=True, blank=True)
     started_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     
     # Execution data
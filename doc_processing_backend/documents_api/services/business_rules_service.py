@@ -135,7 +135,12 @@ class BusinessRulesService:
             return rules_updated, workflows_updated
         
         rules_count, workflows_count = await activate_rules()
-        
+
+        # Drop the cached rules so the activation takes effect immediately
+        from .validation_service import ValidationEngine
+        for doc_type in self.BUSINESS_TYPES[business_type]['document_types']:
+            ValidationEngine.invalidate_rule_cache(doc_type)
+
         return {
             'business_type': business_type,
             'activated_rules': rules_count,
@@ -165,7 +170,12 @@ class BusinessRulesService:
             return rules_updated, workflows_updated
         
         rules_count, workflows_count = await deactivate_rules()
-        
+
+        # Drop the cached rules so the deactivation takes effect immediately
+        from .validation_service import ValidationEngine
+        for doc_type in self.BUSINESS_TYPES[business_type]['document_types']:
+            ValidationEngine.invalidate_rule_cache(doc_type)
+
         return {
             'business_type': business_type,
             'deactivated_rules': rules_count,
@@ -191,20 +201,19 @@ class BusinessRulesService:
         """
         Validate a document against business-specific rules
         """
-        from .validation_service import ValidationEngine
-        
+        from .validation_service import validate_document_data
+
         # Get business type from document type
         business_type = self._get_business_type_from_document_type(document_type)
-        
+
         if not business_type:
             return {
                 'status': 'no_business_type',
                 'message': f'No business type found for document type: {document_type}'
             }
-        
-        # Use the validation engine
-        validation_engine = ValidationEngine()
-        validation_result = await validation_engine.validate_document_data(document_data, document_type)
+
+        # Use the shared validation engine
+        validation_result = await validate_document_data(document_data, document_type)
         
         # Add business type specific information
         validation_result['business_type'] = business_type
@@ -4,6 +4,7 @@ import os
 import json
 import re
 from datetime import datetime
+from django.utils import timezone
 from typing import Dict, List, Any, Tuple, Optional
 import io
 import math
@@ -62,7 +63,7 @@ async def extract_data(file_path: str) -> DocumentData:
         llm_results = await process_document_with_llm(extracted_text)
         
         # Add metadata and extraction time
-        llm_results["extraction_time"] = datetime.now().isoformat()
+        llm_results["extraction_time"] = timezone.now().isoformat()
         llm_results["file_type"] = os.path.splitext(file_path)[1][1:] if os.path.splitext(file_path)[1] else "unknown"
         llm_results["raw_text"] = extracted_text
         
@@ -93,7 +94,7 @@ async def extract_data(file_path: str) -> DocumentData:
         extracted_data["raw_text"] = extracted_text
         
         # Add metadata and validate extraction
-        extracted_data["extraction_time"] = datetime.now().isoformat()
+        extracted_data["extraction_time"] = timezone.now().isoformat()
         extracted_data["file_type"] = file_extension[1:] if file_extension else "unknown"  # Remove leading dot
         
         # Validate the extracted data
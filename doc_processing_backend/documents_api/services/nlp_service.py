@@ -1,6 +1,7 @@
 import asyncio
 import random
 import re
+from django.conf import settings
 from nltk.sentiment import SentimentIntensityAnalyzer
 from nltk.tokenize import sent_tokenize
 import nltk
@@ -295,8 +296,9 @@ async def extract_text_for_nlp(file_path):
     Extracts text content from document for NLP processing.
     This is a placeholder that would be replaced with actual OCR/extraction logic.
     """
-    # Simulate processing time
-    await asyncio.sleep(1)
+    # Simulate processing time only when explicitly enabled
+    if getattr(settings, 'WORKFLOW_SIMULATE_LATENCY', False):
+        await asyncio.sleep(1)
     
     # Return sample texts based on different document types
     sample_texts = [
@@ -5,8 +5,32 @@ from collections import defaultdict, Counter
 from decimal import Decimal
 from datetime import datetime
 from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db.models import Count, Max
 from ..models import Document, ValidationRule
 import statistics
+import numpy as np
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Candidate format patterns for the regex analyzer, compiled once at import
+# so the (patterns x values) scan pays no per-match compile/cache lookups
+_CANDIDATE_PATTERNS = tuple(
+    (re.compile(pattern), pattern, name)
+    for pattern, name in (
+        (r'^[A-Z]{2,3}-\d{4,}$', 'invoice_number'),
+        (r'^INV-\d{4,}$', 'invoice_number_inv'),
+        (r'^[A-Z]{2}\d{6}$', 'reference_code'),
+        (r'^\d{4}-\d{2}-\d{2}$', 'date_iso'),
+        (r'^\d{2}/\d{2}/\d{4}$', 'date_us'),
+        (r'^[+]?[\d\s\-\(\)]+$', 'phone'),
+        (r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', 'email'),
+    )
+)
 
 
 class PatternAnalysisService:
@@ -22,6 +46,12 @@ class PatternAnalysisService:
             'enum': self._analyze_enum_patterns,
             'cross_reference': self._analyze_cross_reference_patterns,
         }
+        self.rule_builders = {
+            'data_type': self._build_data_type_rule,
+            'regex': self._build_regex_rule,
+            'range': self._build_range_rule,
+            'enum': self._build_enum_rule,
+        }
     
     async def analyze_document_patterns(self, document_type: str, min_samples: int = 5) -> Dict[str, Any]:
         """
@@ -35,6 +65,17 @@ class PatternAnalysisService:
             Dict containing suggested validation rules and analysis results
         """
         # Get processed documents of the specified type
+        @sync_to_async
+        def get_cache_key(doc_type):
+            # Key on document count and newest upload so the cache
+            # invalidates itself as soon as the document set changes
+            stats = Document.objects.filter(
+                document_type=doc_type,
+                status='processed',
+                extracted_data__isnull=False
+            ).aggregate(count=Count('id'), latest=Max('uploaded_at'))
+            return f"pattern_analysis:{doc_type}:{min_samples}:{stats['count']}:{stats['latest']}"
+
         @sync_to_async
         def get_documents(doc_type):
             return list(Document.objects.filter(
@@ -42,7 +83,12 @@ class PatternAnalysisService:
                 status='processed',
                 extracted_data__isnull=False
             ).values('id', 'extracted_data', 'filename'))
-        
+
+        cache_key = await get_cache_key(document_type)
+        cached_result = cache.get(cache_key)
+        if cached_result is not None:
+            return cached_result
+
         documents = await get_documents(document_type)
         
         if len(documents) < min_samples:
@@ -72,13 +118,15 @@ class PatternAnalysisService:
                     if suggested_rule:
                         suggested_rules.append(suggested_rule)
         
-        return {
+        result = {
             'status': 'success',
             'document_type': document_type,
             'analyzed_documents': len(documents),
             'analysis_results': analysis_results,
             'suggested_rules': suggested_rules
         }
+        cache.set(cache_key, result, timeout=60 * 60)
+        return result
     
     async def auto_create_validation_rules(self, document_type: str, confidence_threshold: float = 0.9) -> Dict[str, Any]:
         """
@@ -152,7 +200,13 @@ class PatternAnalysisService:
                     'rule_type': created_rule.rule_type,
                     'confidence': rule_data.get('confidence', 0)
                 })
-        
+
+        if created_rules:
+            # Make the new rules visible to the next validation immediately
+            # instead of after the rule cache's TTL expires
+            from .validation_service import ValidationEngine
+            ValidationEngine.invalidate_rule_cache(document_type)
+
         return {
             'status': 'success',
             'document_type': document_type,
@@ -161,25 +215,60 @@ class PatternAnalysisService:
             'total_created': len(created_rules)
         }
     
-    def _extract_field_data(self, documents: List[Dict]) -> Dict[str, List[Any]]:
-        """Extract field data from documents for pattern analysis."""
-        field_data = defaultdict(list)
-        
+    def _extract_field_data(self, documents: List[Dict]) -> Dict[str, np.ndarray]:
+        """
+        Extract field data from documents for pattern analysis.
+
+        Uses a two-pass approach: the first pass flattens each document and
+        tallies per-field value counts while detecting whether a field is
+        purely numeric; the second pass fills preallocated NumPy arrays
+        (float64 for numeric fields, object otherwise) so downstream
+        analyzers can operate on contiguous memory instead of growing
+        Python lists value by value.
+        """
+        flattened_docs = []
+        field_counts = defaultdict(int)
+        float_fields = {}
+
+        # Pass 1: flatten documents, count values per field and detect dtype
         for doc in documents:
             extracted_data = doc.get('extracted_data', {})
             if not extracted_data:
                 continue
-            
+
+            # TextField-backed setups hand us a JSON string rather than a dict
+            if isinstance(extracted_data, (bytes, str)):
+                extracted_data = _loads(extracted_data)
+
             # Flatten nested data structure
             flattened_data = self._flatten_dict(extracted_data)
-            
+            flattened_docs.append(flattened_data)
+
             for field_name, value in flattened_data.items():
                 # Skip validation results and metadata
                 if field_name.startswith('validation_') or field_name in ['raw_text', 'extraction_time']:
                     continue
-                
-                field_data[field_name].append(value)
-        
+
+                field_counts[field_name] += 1
+                if isinstance(value, float) and field_name not in float_fields:
+                    float_fields[field_name] = True
+                elif not isinstance(value, float):
+                    float_fields[field_name] = False
+
+        # Pass 2: allocate one array per field and fill by index
+        field_data = {
+            field_name: np.empty(count, dtype=np.float64 if float_fields.get(field_name) else object)
+            for field_name, count in field_counts.items()
+        }
+        fill_index = defaultdict(int)
+
+        for flattened_data in flattened_docs:
+            for field_name, value in flattened_data.items():
+                if field_name not in field_data:
+                    continue
+                field_data[field_name][fill_index[field_name]] = value
+                fill_index[field_name] += 1
+
         return field_data
     
     def _flatten_dict(self, data: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
@@ -204,13 +293,35 @@ class PatternAnalysisService:
     def _analyze_field_patterns(self, field_name: str, field_values: List[Any], document_type: str) -> Dict[str, Any]:
         """Analyze patterns in a specific field."""
         analysis = {}
-        
-        # Remove None values and empty strings
-        clean_values = [v for v in field_values if v is not None and v != '']
-        
-        if not clean_values:
+
+        # Remove None values and empty strings (float64 arrays contain neither)
+        if isinstance(field_values, np.ndarray) and field_values.dtype != object:
+            clean_values = field_values
+        else:
+            clean_values = [v for v in field_values if v is not None and v != '']
+
+        if len(clean_values) == 0:
             return analysis
-        
+
+        # Short-circuit when every value is identical (common for constant
+        # fields like a fixed country or currency) - no analyzer needs to run
+        if len(clean_values) > 1:
+            first = clean_values[0]
+            if isinstance(clean_values, np.ndarray) and clean_values.dtype != object:
+                all_identical = bool((clean_values == first).all())
+            else:
+                # all() short-circuits on the first mismatch, unlike set()
+                all_identical = all(v == first for v in clean_values[1:])
+            if all_identical:
+                return {
+                    'enum': {
+                        'values': [str(first)],
+                        'confidence': 1.0,
+                        'unique_count': 1,
+                        'total_values': len(clean_values)
+                    }
+                }
+
         # Analyze each pattern type
         for pattern_type, analyzer_func in self.pattern_analyzers.items():
             try:
@@ -256,9 +367,9 @@ class PatternAnalysisService:
         if not type_counts:
             return None
         
-        # Determine most common type
-        most_common_type, count = type_counts.most_common(1)[0]
-        confidence = count / len(values)
+        # Determine most common type (max avoids the heap behind most_common)
+        most_common_type = max(type_counts, key=type_counts.get)
+        confidence = type_counts[most_common_type] / len(values)
         
         if confidence >= 0.7:  # At least 70% of values match the type
             return {
@@ -272,27 +383,16 @@ class PatternAnalysisService:
     
     def _analyze_regex_patterns(self, field_name: str, values: List[Any], document_type: str) -> Optional[Dict[str, Any]]:
         """Analyze regex patterns in field values."""
-        # Convert all values to strings
-        str_values = [str(v) for v in values]
-        
-        # Common patterns to check
-        patterns = [
-            (r'^[A-Z]{2,3}-\d{4,}$', 'invoice_number'),
-            (r'^INV-\d{4,}$', 'invoice_number_inv'),
-            (r'^[A-Z]{2}\d{6}$', 'reference_code'),
-            (r'^\d{4}-\d{2}-\d{2}$', 'date_iso'),
-            (r'^\d{2}/\d{2}/\d{4}$', 'date_us'),
-            (r'^[+]?[\d\s\-\(\)]+$', 'phone'),
-            (r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', 'email'),
-        ]
-        
+        # Convert to strings; skip the str() call for values that already are
+        str_values = [v if type(v) is str else str(v) for v in values]
+
         best_pattern = None
         best_confidence = 0
-        
-        for pattern, pattern_name in patterns:
-            matches = sum(1 for value in str_values if re.match(pattern, value))
+
+        for compiled, pattern, pattern_name in _CANDIDATE_PATTERNS:
+            matches = sum(1 for value in str_values if compiled.match(value))
             confidence = matches / len(str_values)
-            
+
             if confidence > best_confidence and confidence >= 0.8:
                 best_confidence = confidence
                 best_pattern = {
@@ -302,40 +402,53 @@ class PatternAnalysisService:
                     'matches': matches,
                     'total': len(str_values)
                 }
-        
+
         return best_pattern
     
     def _analyze_range_patterns(self, field_name: str, values: List[Any], document_type: str) -> Optional[Dict[str, Any]]:
         """Analyze numeric range patterns."""
-        # Extract numeric values
-        numeric_values = []
-        for value in values:
-            try:
-                if isinstance(value, (int, float)):
-                    numeric_values.append(float(value))
-                elif isinstance(value, str):
-                    # Try to extract numeric value from string
-                    cleaned = re.sub(r'[^\d.-]', '', value)
-                    if cleaned:
-                        numeric_values.append(float(cleaned))
-            except:
-                continue
-        
+        if isinstance(values, np.ndarray) and values.dtype == np.float64:
+            # Numeric fields arrive as contiguous float64 arrays - use them directly
+            numeric_values = values
+        else:
+            # Extract numeric values
+            numeric_values = []
+            for value in values:
+                try:
+                    if isinstance(value, (int, float)):
+                        numeric_values.append(float(value))
+                    elif isinstance(value, str):
+                        # Try to extract numeric value from string
+                        cleaned = re.sub(r'[^\d.-]', '', value)
+                        if cleaned:
+                            numeric_values.append(float(cleaned))
+                except:
+                    continue
+
         if len(numeric_values) < 3:  # Need at least 3 values for range analysis
             return None
-        
-        # Calculate statistics
-        min_val = min(numeric_values)
-        max_val = max(numeric_values)
-        mean_val = statistics.mean(numeric_values)
-        std_dev = statistics.stdev(numeric_values) if len(numeric_values) > 1 else 0
-        
+
+        # Calculate statistics (vectorized when the values are a NumPy array)
+        if isinstance(numeric_values, np.ndarray):
+            min_val = float(numeric_values.min())
+            max_val = float(numeric_values.max())
+            mean_val = float(numeric_values.mean())
+            std_dev = float(numeric_values.std(ddof=1)) if len(numeric_values) > 1 else 0
+        else:
+            min_val = min(numeric_values)
+            max_val = max(numeric_values)
+            mean_val = statistics.mean(numeric_values)
+            std_dev = statistics.stdev(numeric_values) if len(numeric_values) > 1 else 0
+
         # Define reasonable range (mean ± 2 standard deviations)
         range_min = max(min_val, mean_val - 2 * std_dev)
         range_max = min(max_val, mean_val + 2 * std_dev)
-        
+
         # Check how many values fall within this range
-        values_in_range = sum(1 for v in numeric_values if range_min <= v <= range_max)
+        if isinstance(numeric_values, np.ndarray):
+            values_in_range = int(((numeric_values >= range_min) & (numeric_values <= range_max)).sum())
+        else:
+            values_in_range = sum(1 for v in numeric_values if range_min <= v <= range_max)
         confidence = values_in_range / len(numeric_values)
         
         if confidence >= 0.8:
@@ -356,14 +469,13 @@ class PatternAnalysisService:
     
     def _analyze_enum_patterns(self, field_name: str, values: List[Any], document_type: str) -> Optional[Dict[str, Any]]:
         """Analyze enumeration patterns (limited set of values)."""
-        # Count unique values
-        value_counts = Counter(str(v) for v in values)
-        unique_values = list(value_counts.keys())
-        
+        # Count unique values, avoiding str() for already-string values
+        value_counts = Counter(v if type(v) is str else str(v) for v in values)
+
         # Check if it's a good candidate for enumeration
         total_values = len(values)
-        unique_count = len(unique_values)
-        
+        unique_count = len(value_counts)
+
         # Good enumeration candidates:
         # - Small number of unique values relative to total
         # - Each unique value appears multiple times
@@ -373,7 +485,8 @@ class PatternAnalysisService:
             if min_occurrences >= 2:
                 confidence = 1.0 - (unique_count / total_values)
                 return {
-                    'values': unique_values,
+                    # Only materialize the key list for confirmed enums
+                    'values': list(value_counts),
                     'confidence': confidence,
                     'unique_count': unique_count,
                     'total_values': total_values,
@@ -390,47 +503,62 @@ class PatternAnalysisService:
     
     def _create_rule_suggestion(self, field_name: str, rule_type: str, patterns: Dict[str, Any], document_type: str) -> Optional[Dict[str, Any]]:
         """Create a validation rule suggestion based on pattern analysis."""
-        base_rule = {
+        builder = self.rule_builders.get(rule_type)
+        if not builder:
+            return None
+        return builder(field_name, patterns, document_type)
+
+    def _build_data_type_rule(self, field_name: str, patterns: Dict[str, Any], document_type: str) -> Dict[str, Any]:
+        """Build a data_type rule suggestion."""
+        return {
             'field_name': field_name,
-            'rule_type': rule_type,
+            'rule_type': 'data_type',
             'document_type': document_type,
             'confidence': patterns.get('confidence', 0),
-            'description': f'Auto-generated {rule_type} rule for {field_name} based on pattern analysis',
-            'auto_created': True
+            'auto_created': True,
+            'name': f'{field_name}_type_check',
+            'rule_pattern': patterns['type'],
+            'description': f'Validates that {field_name} is of type {patterns["type"]} (confidence: {patterns["confidence"]:.2f})'
+        }
+
+    def _build_regex_rule(self, field_name: str, patterns: Dict[str, Any], document_type: str) -> Dict[str, Any]:
+        """Build a regex rule suggestion."""
+        return {
+            'field_name': field_name,
+            'rule_type': 'regex',
+            'document_type': document_type,
+            'confidence': patterns.get('confidence', 0),
+            'auto_created': True,
+            'name': f'{field_name}_format_check',
+            'rule_pattern': patterns['pattern'],
+            'description': f'Validates {field_name} format as {patterns["name"]} (confidence: {patterns["confidence"]:.2f})'
+        }
+
+    def _build_range_rule(self, field_name: str, patterns: Dict[str, Any], document_type: str) -> Dict[str, Any]:
+        """Build a range rule suggestion."""
+        return {
+            'field_name': field_name,
+            'rule_type': 'range',
+            'document_type': document_type,
+            'confidence': patterns.get('confidence', 0),
+            'auto_created': True,
+            'name': f'{field_name}_range_check',
+            'rule_pattern': f'{patterns["min"]:.2f},{patterns["max"]:.2f}',
+            'description': f'Validates {field_name} is within range {patterns["min"]:.2f} to {patterns["max"]:.2f} (confidence: {patterns["confidence"]:.2f})'
+        }
+
+    def _build_enum_rule(self, field_name: str, patterns: Dict[str, Any], document_type: str) -> Dict[str, Any]:
+        """Build an enum rule suggestion."""
+        return {
+            'field_name': field_name,
+            'rule_type': 'enum',
+            'document_type': document_type,
+            'confidence': patterns.get('confidence', 0),
+            'auto_created': True,
+            'name': f'{field_name}_enum_check',
+            'rule_pattern': ','.join(patterns['values']),
+            'description': f'Validates {field_name} is one of: {", ".join(patterns["values"][:5])}{"..." if len(patterns["values"]) > 5 else ""} (confidence: {patterns["confidence"]:.2f})'
         }
-        
-        if rule_type == 'data_type':
-            base_rule.update({
-                'name': f'{field_name}_type_check',
-                'rule_pattern': patterns['type'],
-                'description': f'Validates that {field_name} is of type {patterns["type"]} (confidence: {patterns["confidence"]:.2f})'
-            })
-        
-        elif rule_type == 'regex':
-            base_rule.update({
-                'name': f'{field_name}_format_check',
-                'rule_pattern': patterns['pattern'],
-                'description': f'Validates {field_name} format as {patterns["name"]} (confidence: {patterns["confidence"]:.2f})'
-            })
-        
-        elif rule_type == 'range':
-            base_rule.update({
-                'name': f'{field_name}_range_check',
-                'rule_pattern': f'{patterns["min"]:.2f},{patterns["max"]:.2f}',
-                'description': f'Validates {field_name} is within range {patterns["min"]:.2f} to {patterns["max"]:.2f} (confidence: {patterns["confidence"]:.2f})'
-            })
-        
-        elif rule_type == 'enum':
-            base_rule.update({
-                'name': f'{field_name}_enum_check',
-                'rule_pattern': ','.join(patterns['values']),
-                'description': f'Validates {field_name} is one of: {", ".join(patterns["values"][:5])}{"..." if len(patterns["values"]) > 5 else ""} (confidence: {patterns["confidence"]:.2f})'
-            })
-        
-        else:
-            return None
-        
-        return base_rule
     
     # Helper methods
     def _is_currency_string(self, value: str) -> bool:
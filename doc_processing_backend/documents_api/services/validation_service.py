@@ -1,8 +1,111 @@
+import asyncio
 import re
+import time
+from functools import lru_cache
 from typing import Dict, Any, List, Tuple
 from asgiref.sync import sync_to_async
+from django.conf import settings
+import numpy as np
 from ..models import ValidationRule
 
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+
+def _safe_compile(pattern: str):
+    """
+    Compile an untrusted rule pattern. When enabled and available, RE2's
+    linear-time engine is preferred so adversarial patterns cannot trigger
+    catastrophic backtracking; patterns RE2 rejects (e.g. backreferences)
+    fall back to the standard re module.
+    """
+    if re2 is not None and getattr(settings, 'DOCUFLOW_USE_RE2', False):
+        try:
+            return re2.compile(pattern)
+        except Exception:
+            pass
+    return re.compile(pattern)
+
+# Process-level cache of active rules per document type. Validating a batch
+# of same-type documents otherwise re-issues an identical query per document.
+_RULES_CACHE = {}
+_RULES_CACHE_TTL = 60  # seconds
+
+# Standard amount fields probed in line items, most common first
+_AMOUNT_FIELDS = ('amount', 'total', 'price', 'value', 'cost')
+
+# Rule application order: cheap checks first so an early failure on a field
+# lets the engine skip that field's expensive regex/cross-reference rules
+_RULE_TYPE_ORDER = ('required', 'data_type', 'enum', 'range', 'regex', 'cross_reference', 'calculation')
+_RULE_TYPE_RANK = {t: i for i, t in enumerate(_RULE_TYPE_ORDER)}
+_EXPENSIVE_RULE_TYPES = frozenset(('regex', 'cross_reference', 'calculation'))
+
+@lru_cache(maxsize=4096)
+def _parse_money_str(value: str) -> float:
+    """
+    Parse a formatted money/number string into a float. Cached because the
+    same formatted amounts recur across line items and documents.
+    """
+    stripped = value.strip()
+    try:
+        # Fast path: plain numeric strings need no currency stripping
+        return float(stripped)
+    except ValueError:
+        pass
+    # Remove currency symbols and formatting, then convert
+    try:
+        return float(stripped.translate(_CURRENCY_STRIP))
+    except ValueError:
+        raise ValueError(f"Cannot convert '{value}' to numeric value")
+
+
+def _parse_range(range_spec):
+    """Pre-parse a 'min,max' / 'min-max' spec; returns (min, max) or None."""
+    if ',' in range_spec:
+        min_val, max_val = range_spec.split(',', 1)
+    elif '-' in range_spec:
+        min_val, max_val = range_spec.split('-', 1)
+    else:
+        return None
+    try:
+        return (
+            float(min_val.strip()) if min_val.strip() else float('-inf'),
+            float(max_val.strip()) if max_val.strip() else float('inf')
+        )
+    except ValueError:
+        return None
+
+
+def _preprocess_rules(rules):
+    """
+    Attach precompiled/preparsed artifacts to freshly loaded rules so the
+    per-document validators do pure matching instead of re-parsing
+    rule_pattern on every application.
+    """
+    for rule in rules:
+        if rule.rule_type == 'regex':
+            try:
+                rule._compiled_pattern = _safe_compile(rule.rule_pattern)
+            except re.error:
+                rule._compiled_pattern = None
+        elif rule.rule_type == 'enum':
+            rule._enum_values = tuple(v.strip() for v in (rule.rule_pattern or '').split(','))
+        elif rule.rule_type == 'range':
+            rule._range = _parse_range(rule.rule_pattern or '')
+    return rules
+
+
+# Helper validator patterns, compiled once per process.
+# str.translate deletes the currency characters faster than re.sub
+_CURRENCY_STRIP = str.maketrans('', '', '$€£¥₹, \t\n\r\v\f')
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PHONE_CLEAN_RE = re.compile(r'[\s\-\(\)\+\.]')
+# Single alternation covering YYYY-MM-DD, MM/DD/YYYY, MM-DD-YYYY and
+# M/D/YYYY so one match call replaces a loop over four patterns
+_DATE_RE = re.compile(r'^(?:\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4}|\d{2}-\d{2}-\d{4}|\d{1,2}/\d{1,2}/\d{4})')
+
 
 class ValidationEngine:
     """
@@ -19,6 +122,40 @@ class ValidationEngine:
             'cross_reference': self._validate_cross_reference,
             'calculation': self._validate_calculation,
         }
+        # Built once here so _validate_data_type doesn't allocate a fresh
+        # dict of lambdas on every rule application
+        self.type_validators = {
+            'string': lambda x: isinstance(x, str),
+            'integer': lambda x: isinstance(x, int) or (isinstance(x, str) and x.isdigit()),
+            'float': lambda x: isinstance(x, (int, float)) or self._is_valid_float(x),
+            'number': lambda x: isinstance(x, (int, float)) or self._is_valid_number(x),
+            'currency': self._is_valid_currency,
+            'date': self._is_valid_date,
+            'email': self._is_valid_email,
+            'phone': self._is_valid_phone,
+            'boolean': lambda x: isinstance(x, bool) or str(x).lower() in ['true', 'false', '1', '0']
+        }
+        # Compiled regex cache keyed by pattern string; rule patterns are
+        # reused across documents, so compile each exactly once per engine
+        self._compiled_patterns = {}
+
+    def _get_compiled(self, pattern_str: str) -> 're.Pattern':
+        """Return a compiled regex for the pattern, compiling it only once."""
+        compiled = self._compiled_patterns.get(pattern_str)
+        if compiled is None:
+            compiled = self._compiled_patterns.setdefault(pattern_str, re.compile(pattern_str))
+        return compiled
+
+    @classmethod
+    def invalidate_rule_cache(cls, document_type: str = None):
+        """
+        Drop cached validation rules so the next validation refetches them.
+        Call this after creating, editing or deactivating a ValidationRule.
+        """
+        if document_type is None:
+            _RULES_CACHE.clear()
+        else:
+            _RULES_CACHE.pop(document_type, None)
     
     async def validate_document_data(self, extracted_data: Dict[str, Any], document_type: str) -> Dict[str, Any]:
         """
@@ -34,12 +171,21 @@ class ValidationEngine:
         # Get all active validation rules for this document type
         @sync_to_async
         def get_validation_rules(doc_type):
-            return list(ValidationRule.objects.filter(
+            cached = _RULES_CACHE.get(doc_type)
+            if cached and time.monotonic() - cached[0] < _RULES_CACHE_TTL:
+                return cached[1]
+            rules = _preprocess_rules(list(ValidationRule.objects.filter(
                 document_type=doc_type,
                 is_active=True
-            ).order_by('field_name'))
-        
+            ).order_by('field_name')))
+            _RULES_CACHE[doc_type] = (time.monotonic(), rules)
+            return rules
+
         validation_rules = await get_validation_rules(document_type)
+
+        # Flatten once so every field lookup is a single dict access instead
+        # of an O(depth) traversal with confidence-structure checks per rule
+        flat_data = self._flatten_extracted(extracted_data) if extracted_data else {}
         
         validation_results = {
             'status': 'passed',
@@ -48,7 +194,10 @@ class ValidationEngine:
             'failed_rules': 0,
             'errors': [],
             'warnings': [],
-            'validated_data': extracted_data.copy(),
+            # Shallow copy: callers embed these results back into
+            # extracted_data, so a direct reference would make the saved
+            # payload circular and break JSON serialization
+            'validated_data': extracted_data.copy() if extracted_data else {},
             'field_validations': {}
         }
         
@@ -57,16 +206,55 @@ class ValidationEngine:
             validation_results['warnings'].append(f"No validation rules found for document type: {document_type}")
             return validation_results
         
-        # Apply each validation rule
-        for rule in validation_rules:
-            field_result = self._apply_validation_rule(extracted_data, rule)
+        # Bucket rules cheapest-first; a field that fails a cheap rule is
+        # rejected anyway, so its expensive rules can be skipped outright
+        ordered_rules = sorted(
+            validation_rules,
+            key=lambda r: _RULE_TYPE_RANK.get(r.rule_type, len(_RULE_TYPE_ORDER))
+        )
+        cheap_rules = [r for r in ordered_rules if r.rule_type not in _EXPENSIVE_RULE_TYPES]
+        expensive_rules = [r for r in ordered_rules if r.rule_type in _EXPENSIVE_RULE_TYPES]
+
+        applied = []
+        failed_fields = set()
+
+        for rule in cheap_rules:
+            field_result = self._apply_validation_rule(flat_data, rule)
+            applied.append((rule, field_result))
+            if not field_result['passed']:
+                failed_fields.add(rule.field_name)
+
+        runnable = []
+        for rule in expensive_rules:
+            if rule.field_name in failed_fields:
+                applied.append((rule, {
+                    'rule_name': rule.name,
+                    'field_name': rule.field_name,
+                    'rule_type': rule.rule_type,
+                    'passed': False,
+                    'errors': [f"Rule '{rule.name}' skipped: field '{rule.field_name}' already failed validation"],
+                    'value': None
+                }))
+            else:
+                runnable.append(rule)
+
+        # Apply the remaining expensive rules concurrently - each validator is
+        # independent and the engine holds no per-call state
+        field_results = await asyncio.gather(*(
+            asyncio.to_thread(self._apply_validation_rule, flat_data, rule)
+            for rule in runnable
+        ))
+        applied.extend(zip(runnable, field_results))
+
+        for rule, field_result in applied:
             validation_results['field_validations'][rule.field_name] = field_result
-            
+
             if field_result['passed']:
                 validation_results['passed_rules'] += 1
             else:
                 validation_results['failed_rules'] += 1
-                validation_results['errors'].extend(field_result['errors'])
+                if field_result['errors']:
+                    validation_results['errors'].extend(field_result['errors'])
         
         # Set overall status
         if validation_results['failed_rules'] > 0:
@@ -76,14 +264,14 @@ class ValidationEngine:
         
         return validation_results
     
-    def _apply_validation_rule(self, extracted_data: Dict[str, Any], rule: ValidationRule) -> Dict[str, Any]:
+    def _apply_validation_rule(self, flat_data: Dict[str, Any], rule: ValidationRule) -> Dict[str, Any]:
         """
-        Applies a single validation rule to the extracted data.
-        
+        Applies a single validation rule to the flattened extracted data.
+
         Args:
-            extracted_data: The extracted data from the document
+            flat_data: The extracted data, flattened by _flatten_extracted
             rule: The validation rule to apply
-            
+
         Returns:
             Dict containing the validation result for this specific rule
         """
@@ -92,102 +280,89 @@ class ValidationEngine:
             'field_name': rule.field_name,
             'rule_type': rule.rule_type,
             'passed': False,
-            'errors': [],
+            # None until a rule actually fails; passing rules (the common
+            # case) then allocate no per-rule error list at all
+            'errors': None,
             'value': None
         }
         
-        # Store extracted data for cross-reference validation
-        self.current_extracted_data = extracted_data
-        
-        # Get the field value from extracted data
-        field_value = self._get_field_value(extracted_data, rule.field_name)
+        # Dotted paths are already collapsed to single keys by flattening
+        field_value = flat_data.get(rule.field_name)
         field_result['value'] = field_value
-        
+
         # Apply the appropriate validator
         validator_func = self.rule_validators.get(rule.rule_type)
         if not validator_func:
-            field_result['errors'].append(f"Unknown rule type: {rule.rule_type}")
+            field_result['errors'] = [f"Unknown rule type: {rule.rule_type}"]
             return field_result
-        
+
         try:
-            is_valid, error_message = validator_func(field_value, rule.rule_pattern, rule)
+            is_valid, error_message = validator_func(field_value, rule.rule_pattern, rule, flat_data)
             field_result['passed'] = is_valid
             if not is_valid and error_message:
-                field_result['errors'].append(error_message)
+                field_result['errors'] = [error_message]
         except Exception as e:
-            field_result['errors'].append(f"Validation error for rule '{rule.name}': {str(e)}")
+            field_result['errors'] = [f"Validation error for rule '{rule.name}': {str(e)}"]
         
         return field_result
     
-    def _get_field_value(self, extracted_data: Dict[str, Any], field_name: str) -> Any:
+    def _flatten_extracted(self, data: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
         """
-        Extracts field value from the extracted data, handling nested fields.
-        Supports both direct field access and nested field access with dot notation.
+        Flatten nested extracted data into dot-notation keys, unwrapping
+        confidence structures ({'value': x, 'confidence': ...}) as it goes.
+        Runs once per validation so rules hit a flat dict afterwards.
         """
-        if not extracted_data:
-            return None
-        
-        # Handle nested field names (e.g., "invoice.totalAmount")
-        if '.' in field_name:
-            keys = field_name.split('.')
-            value = extracted_data
-            for key in keys:
-                if isinstance(value, dict):
-                    # Handle both direct key and key with confidence structure
-                    if key in value:
-                        value = value[key]
-                        # If value has 'value' key (confidence structure), extract it
-                        if isinstance(value, dict) and 'value' in value:
-                            value = value['value']
-                    else:
-                        return None
+        flattened = {}
+        for key, value in data.items():
+            full_key = f"{prefix}.{key}" if prefix else key
+            if isinstance(value, dict):
+                if 'value' in value:
+                    # Handle confidence structure
+                    flattened[full_key] = value['value']
                 else:
-                    return None
-            return value
-        else:
-            # Direct field access
-            if field_name in extracted_data:
-                field_data = extracted_data[field_name]
-                # Handle confidence structure
-                if isinstance(field_data, dict) and 'value' in field_data:
-                    return field_data['value']
-                return field_data
-            return None
-    
-    def _validate_regex(self, value: Any, pattern: str, rule: ValidationRule) -> Tuple[bool, str]:
+                    flattened.update(self._flatten_extracted(value, full_key))
+            else:
+                flattened[full_key] = value
+        return flattened
+
+    def _validate_regex(self, value: Any, pattern: str, rule: ValidationRule, extracted_data: Dict[str, Any]) -> Tuple[bool, str]:
         """Validates value against a regular expression pattern."""
         if value is None:
             return False, f"Field '{rule.field_name}' is missing but required for regex validation"
         
         # Convert value to string for regex validation
         str_value = str(value)
-        
-        try:
-            if re.match(pattern, str_value):
-                return True, ""
-            else:
-                return False, f"Field '{rule.field_name}' value '{str_value}' does not match required pattern: {pattern}"
-        except re.error as e:
-            return False, f"Invalid regex pattern in rule '{rule.name}': {str(e)}"
+
+        compiled = getattr(rule, '_compiled_pattern', None)
+        if compiled is None:
+            try:
+                compiled = self._get_compiled(pattern)
+            except re.error as e:
+                return False, f"Invalid regex pattern in rule '{rule.name}': {str(e)}"
+
+        if compiled.match(str_value):
+            return True, ""
+        else:
+            return False, f"Field '{rule.field_name}' value '{str_value}' does not match required pattern: {pattern}"
     
-    def _validate_data_type(self, value: Any, expected_type: str, rule: ValidationRule) -> Tuple[bool, str]:
+    def _validate_data_type(self, value: Any, expected_type: str, rule: ValidationRule, extracted_data: Dict[str, Any]) -> Tuple[bool, str]:
         """Validates value data type."""
         if value is None:
             return False, f"Field '{rule.field_name}' is missing but required for data type validation"
         
-        type_validators = {
-            'string': lambda x: isinstance(x, str),
-            'integer': lambda x: isinstance(x, int) or (isinstance(x, str) and x.isdigit()),
-            'float': lambda x: isinstance(x, (int, float)) or self._is_valid_float(x),
-            'number': lambda x: isinstance(x, (int, float)) or self._is_valid_number(x),
-            'currency': lambda x: self._is_valid_currency(x),
-            'date': lambda x: self._is_valid_date(x),
-            'email': lambda x: self._is_valid_email(x),
-            'phone': lambda x: self._is_valid_phone(x),
-            'boolean': lambda x: isinstance(x, bool) or str(x).lower() in ['true', 'false', '1', '0']
-        }
-        
-        validator = type_validators.get(expected_type.lower())
+        expected = expected_type.lower()
+
+        # Fast path: the extractor already produced a plain int/float, so the
+        # isinstance chains and string-parsing fallbacks can be skipped
+        value_type = type(value)
+        if value_type is int:
+            if expected in ('integer', 'float', 'number', 'currency'):
+                return True, ""
+        elif value_type is float:
+            if expected in ('float', 'number', 'currency'):
+                return True, ""
+
+        validator = self.type_validators.get(expected)
         if not validator:
             return False, f"Unknown data type '{expected_type}' in rule '{rule.name}'"
         
@@ -196,29 +371,34 @@ class ValidationEngine:
         else:
             return False, f"Field '{rule.field_name}' value '{value}' is not of expected type: {expected_type}"
     
-    def _validate_required(self, value: Any, pattern: str, rule: ValidationRule) -> Tuple[bool, str]:
+    def _validate_required(self, value: Any, pattern: str, rule: ValidationRule, extracted_data: Dict[str, Any]) -> Tuple[bool, str]:
         """Validates that a required field is present and not empty."""
         if value is None or value == "" or (isinstance(value, str) and value.strip() == ""):
             return False, f"Required field '{rule.field_name}' is missing or empty"
         return True, ""
     
-    def _validate_range(self, value: Any, range_spec: str, rule: ValidationRule) -> Tuple[bool, str]:
+    def _validate_range(self, value: Any, range_spec: str, rule: ValidationRule, extracted_data: Dict[str, Any]) -> Tuple[bool, str]:
         """Validates value is within specified range (format: 'min,max' or 'min-max')."""
         if value is None:
             return False, f"Field '{rule.field_name}' is missing but required for range validation"
         
         try:
-            # Parse range specification (supports both 'min,max' and 'min-max' formats)
-            if ',' in range_spec:
-                min_val, max_val = range_spec.split(',', 1)
-            elif '-' in range_spec:
-                min_val, max_val = range_spec.split('-', 1)
+            # Use the range pre-parsed at rule-load time when available
+            parsed_range = getattr(rule, '_range', None)
+            if parsed_range:
+                min_val, max_val = parsed_range
             else:
-                return False, f"Invalid range format in rule '{rule.name}'. Use 'min,max' or 'min-max'"
-            
-            min_val = float(min_val.strip()) if min_val.strip() else float('-inf')
-            max_val = float(max_val.strip()) if max_val.strip() else float('inf')
-            
+                # Parse range specification (supports both 'min,max' and 'min-max' formats)
+                if ',' in range_spec:
+                    min_val, max_val = range_spec.split(',', 1)
+                elif '-' in range_spec:
+                    min_val, max_val = range_spec.split('-', 1)
+                else:
+                    return False, f"Invalid range format in rule '{rule.name}'. Use 'min,max' or 'min-max'"
+
+                min_val = float(min_val.strip()) if min_val.strip() else float('-inf')
+                max_val = float(max_val.strip()) if max_val.strip() else float('inf')
+
             # Convert value to float for comparison
             numeric_value = float(value)
             
@@ -230,13 +410,16 @@ class ValidationEngine:
         except ValueError as e:
             return False, f"Invalid numeric value for range validation in rule '{rule.name}': {str(e)}"
     
-    def _validate_enum(self, value: Any, allowed_values: str, rule: ValidationRule) -> Tuple[bool, str]:
+    def _validate_enum(self, value: Any, allowed_values: str, rule: ValidationRule, extracted_data: Dict[str, Any]) -> Tuple[bool, str]:
         """Validates value is one of the allowed enumeration values."""
         if value is None:
             return False, f"Field '{rule.field_name}' is missing but required for enumeration validation"
         
-        # Parse allowed values (comma-separated)
-        allowed_list = [v.strip() for v in allowed_values.split(',')]
+        # Use the values pre-split at rule-load time when available
+        allowed_list = getattr(rule, '_enum_values', None)
+        if allowed_list is None:
+            # Parse allowed values (comma-separated)
+            allowed_list = [v.strip() for v in allowed_values.split(',')]
         str_value = str(value).strip()
         
         if str_value in allowed_list:
@@ -244,7 +427,7 @@ class ValidationEngine:
         else:
             return False, f"Field '{rule.field_name}' value '{str_value}' is not in allowed values: {', '.join(allowed_list)}"
     
-    def _validate_cross_reference(self, value: Any, pattern: str, rule: ValidationRule) -> Tuple[bool, str]:
+    def _validate_cross_reference(self, value: Any, pattern: str, rule: ValidationRule, extracted_data: Dict[str, Any]) -> Tuple[bool, str]:
         """Validates value against a cross-reference calculation (e.g., total vs sum of line items)."""
         if value is None:
             return False, f"Field '{rule.field_name}' is missing but required for cross-reference validation"
@@ -252,8 +435,9 @@ class ValidationEngine:
         if not rule.reference_field:
             return False, f"Cross-reference validation requires a reference_field in rule '{rule.name}'"
         
-        # Get the reference field value (e.g., line items)
-        reference_value = self._get_field_value(self.current_extracted_data, rule.reference_field)
+        # Get the reference field value (e.g., line items) - the data is
+        # already flattened, so this is a single lookup
+        reference_value = extracted_data.get(rule.reference_field)
         
         if reference_value is None:
             return False, f"Reference field '{rule.reference_field}' is missing for cross-reference validation"
@@ -280,7 +464,7 @@ class ValidationEngine:
         except Exception as e:
             return False, f"Error in cross-reference validation for rule '{rule.name}': {str(e)}"
     
-    def _validate_calculation(self, value: Any, pattern: str, rule: ValidationRule) -> Tuple[bool, str]:
+    def _validate_calculation(self, value: Any, pattern: str, rule: ValidationRule, extracted_data: Dict[str, Any]) -> Tuple[bool, str]:
         """Validates value against a calculation rule (similar to cross-reference but more flexible)."""
         if value is None:
             return False, f"Field '{rule.field_name}' is missing but required for calculation validation"
@@ -290,7 +474,7 @@ class ValidationEngine:
         
         # This is similar to cross-reference but allows more complex patterns
         # For now, we'll delegate to cross-reference validation
-        return self._validate_cross_reference(value, pattern, rule)
+        return self._validate_cross_reference(value, pattern, rule, extracted_data)
     
     # Helper methods for cross-reference validation
     def _calculate_reference_value(self, reference_data: Any, calc_type: str, rule: ValidationRule) -> float:
@@ -301,11 +485,18 @@ class ValidationEngine:
         
         # Extract numeric values from the list
         numeric_values = []
+        # Line items in one table usually share a schema, so remember which
+        # amount field matched and probe it first on subsequent items
+        winning_field = None
         for item in reference_data:
             if isinstance(item, dict):
+                if winning_field is not None and winning_field in item:
+                    numeric_values.append(self._extract_numeric_value(item[winning_field]))
+                    continue
                 # Look for common amount/total fields in line items
-                for field_name in ['amount', 'total', 'price', 'value', 'cost']:
+                for field_name in _AMOUNT_FIELDS:
                     if field_name in item:
+                        winning_field = field_name
                         numeric_values.append(self._extract_numeric_value(item[field_name]))
                         break
                 else:
@@ -325,18 +516,21 @@ class ValidationEngine:
         
         if not numeric_values:
             raise ValueError(f"No numeric values found in reference field '{rule.reference_field}'")
-        
-        # Perform calculation based on type
+
+        # Perform calculation based on type; the reductions run as C loops
+        # over a contiguous float64 array instead of Python-level iteration
+        if calc_type == 'count':
+            return len(numeric_values)
+
+        arr = np.fromiter(numeric_values, dtype=np.float64, count=len(numeric_values))
         if calc_type == 'sum':
-            return sum(numeric_values)
+            return float(arr.sum())
         elif calc_type == 'average':
-            return sum(numeric_values) / len(numeric_values)
-        elif calc_type == 'count':
-            return len(numeric_values)
+            return float(arr.mean())
         elif calc_type == 'min':
-            return min(numeric_values)
+            return float(arr.min())
         elif calc_type == 'max':
-            return max(numeric_values)
+            return float(arr.max())
         else:
             raise ValueError(f"Unknown calculation type: {calc_type}")
     
@@ -346,12 +540,7 @@ class ValidationEngine:
             return float(value)
         
         if isinstance(value, str):
-            # Remove currency symbols and formatting
-            cleaned = re.sub(r'[$€£¥₹,\s]', '', value.strip())
-            try:
-                return float(cleaned)
-            except ValueError:
-                raise ValueError(f"Cannot convert '{value}' to numeric value")
+            return _parse_money_str(value)
         
         if isinstance(value, dict) and 'value' in value:
             return self._extract_numeric_value(value['value'])
@@ -377,7 +566,7 @@ class ValidationEngine:
             return True
         if isinstance(value, str):
             # Remove common currency symbols and check if it's a valid number
-            cleaned = re.sub(r'[$€£¥₹,\s]', '', str(value))
+            cleaned = str(value).translate(_CURRENCY_STRIP)
             return self._is_valid_float(cleaned)
         return False
     
@@ -386,23 +575,14 @@ class ValidationEngine:
         if not isinstance(value, str):
             return False
         
-        # Common date patterns
-        date_patterns = [
-            r'\d{4}-\d{2}-\d{2}',  # YYYY-MM-DD
-            r'\d{2}/\d{2}/\d{4}',  # MM/DD/YYYY
-            r'\d{2}-\d{2}-\d{4}',  # MM-DD-YYYY
-            r'\d{1,2}/\d{1,2}/\d{4}',  # M/D/YYYY
-        ]
-        
-        return any(re.match(pattern, str(value).strip()) for pattern in date_patterns)
+        return _DATE_RE.match(str(value).strip()) is not None
     
     def _is_valid_email(self, value: Any) -> bool:
         """Check if value looks like an email address."""
         if not isinstance(value, str):
             return False
         
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(email_pattern, str(value).strip()) is not None
+        return _EMAIL_RE.match(str(value).strip()) is not None
     
     def _is_valid_phone(self, value: Any) -> bool:
         """Check if value looks like a phone number."""
@@ -410,22 +590,26 @@ class ValidationEngine:
             return False
         
         # Remove common phone formatting characters
-        cleaned = re.sub(r'[\s\-\(\)\+\.]', '', str(value))
+        cleaned = _PHONE_CLEAN_RE.sub('', str(value))
         # Check if remaining characters are digits and reasonable length
         return cleaned.isdigit() and 7 <= len(cleaned) <= 15
 
 
+# Shared engine instance; the engine carries no per-document state, so one
+# instance (and its compiled-pattern cache) can serve all validations
+_engine = ValidationEngine()
+
+
 # Convenience function for external use
 async def validate_document_data(extracted_data: Dict[str, Any], document_type: str) -> Dict[str, Any]:
     """
     Convenience function to validate document data using the ValidationEngine.
-    
+
     Args:
         extracted_data: The extracted data from the document
         document_type: The type of document being validated
-        
+
     Returns:
         Dict containing validation results
     """
-    engine = ValidationEngine()
-    return await engine.validate_document_data(extracted_data, document_type) 
\ No newline at end of file
+    return await _engine.validate_document_data(extracted_data, document_type) 
\ No newline at end of file
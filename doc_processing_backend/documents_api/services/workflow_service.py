@@ -1,18 +1,126 @@
 import asyncio
-import uuid
-import smtplib
-from datetime import datetime, timedelta
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from typing import Dict, Any, Optional, List
 from django.utils import timezone
-from django.db import transaction
 from django.contrib.auth.models import User
-from django.core.mail import send_mail
+from django.core.mail import get_connection, send_mail
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch
 from asgiref.sync import sync_to_async
 import logging
 
+# Hoisted out of the request-time hot path: models only import Django,
+# never services, so there is no import cycle to guard against
+from ..models import (
+    Document,
+    DocumentApproval,
+    IntegrationConfiguration,
+    Notification,
+    Workflow,
+    WorkflowExecution,
+    WorkflowStep,
+)
+from .integration_service import integration_service
+
+# Shared mail pool: notification steps enqueue and return immediately
+# while a small bounded worker pool fans out the SMTP I/O. A thread pool
+# is used instead of an asyncio.Queue because the API views each run
+# their own short-lived event loop via asyncio.run, and the pool
+# survives those loops.
+_MAIL_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='workflow-mail')
+
+# Each worker thread keeps its SMTP connection open across sends so a
+# burst of notifications pays the TCP/TLS handshake once per worker
+# instead of once per message
+_mail_local = threading.local()
+
+
+def _send_mail_sync(recipient_email, subject, message, notification_id=None):
+    connection = getattr(_mail_local, 'connection', None)
+    if connection is None:
+        connection = get_connection()
+        _mail_local.connection = connection
+    try:
+        send_mail(
+            subject,
+            message,
+            settings.DEFAULT_FROM_EMAIL,
+            [recipient_email],
+            fail_silently=False,
+            connection=connection
+        )
+    except Exception:
+        logger.exception("Failed to send email to %s", recipient_email)
+        # Drop the connection; the next send from this worker reconnects
+        _mail_local.connection = None
+        if notification_id is not None:
+            Notification.objects.filter(id=notification_id).update(sent_status='failed')
+    else:
+        if notification_id is not None:
+            Notification.objects.filter(id=notification_id).update(
+                sent_status='sent', sent_at=timezone.now()
+            )
+
 logger = logging.getLogger(__name__)
 
+# How long cached per-workflow step definitions stay fresh. Steps are
+# effectively immutable once a workflow is in use, but they can be edited
+# through the REST API, so bound the staleness window.
+_STEP_CACHE_TTL = 60  # seconds
+
+
+def _safe_float(value):
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _condition_gt(field_value, condition_value):
+    a, b = _safe_float(field_value), _safe_float(condition_value)
+    return a is not None and b is not None and a > b
+
+
+def _condition_lt(field_value, condition_value):
+    a, b = _safe_float(field_value), _safe_float(condition_value)
+    return a is not None and b is not None and a < b
+
+
+# Amount fields checked against workflow approval thresholds
+_AMOUNT_FIELDS = ('total', 'amount', 'total_amount', 'grand_total', 'subtotal')
+
+
+def _flatten_fields(data, prefix=''):
+    """
+    Flatten extracted data into dot-keyed values, unwrapping the
+    {'value': ..., 'confidence': ...} structures the extractors emit
+    """
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            if 'value' in value:
+                flat[name] = value['value']
+            else:
+                flat.update(_flatten_fields(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+
+# Operator handlers looked up by condition_operator; unknown operators
+# evaluate to False, matching the old if/elif fall-through
+_CONDITION_OPS = {
+    'eq': lambda field_value, condition_value: str(field_value) == str(condition_value),
+    'gt': _condition_gt,
+    'lt': _condition_lt,
+    'contains': lambda field_value, condition_value: str(condition_value).lower() in str(field_value).lower(),
+}
+
 class AdvancedWorkflowService:
     """
     Advanced workflow service with multi-level approval routing and real-time processing
@@ -21,6 +129,18 @@ class AdvancedWorkflowService:
     def __init__(self):
         self.active_workflows = {}
         self.approval_timeout = 24 * 60 * 60  # 24 hours in seconds
+        # Per-process cache of step definitions: workflow.id -> (expires_at, steps)
+        self._step_cache = {}
+        # Resolved group approvers: (group_name, level) -> (expires_at, user)
+        self._group_cache = {}
+        # Dispatch table resolves each step handler with one dict lookup
+        # instead of walking an if/elif chain per step
+        self.step_handlers = {
+            'approval': self._execute_approval_step,
+            'integration': self._execute_integration_step,
+            'notification': self._execute_notification_step,
+            'processing': self._execute_processing_step,
+        }
     
     async def start_document_workflow(self, document, workflow, started_by=None):
         """
@@ -34,7 +154,6 @@ class AdvancedWorkflowService:
         Returns:
             dict: Details about the started workflow
         """
-        from ..models import WorkflowExecution, WorkflowStep
         
         try:
             # Check if workflow requires approval and document meets criteria
@@ -43,25 +162,25 @@ class AdvancedWorkflowService:
                 if not approval_needed:
                     return await self._auto_approve_document(document, workflow)
             
-            # Create workflow execution record
-            execution = WorkflowExecution(
-                document=document,
-                workflow=workflow,
-                status='started',
-                started_by=started_by,
-                execution_data={
-                    'start_time': timezone.now().isoformat(),
-                    'steps_completed': 0,
-                    'total_steps': await workflow.steps.acount()
-                }
-            )
-            await execution.asave()
-            
-            # Get the first step
-            first_step = await workflow.steps.filter(step_order=1).afirst()
+            # Fetch the step list once: it supplies the step count and the
+            # first step, and tolerates gaps or renumbered orderings where
+            # a filter(step_order=1) lookup would silently find nothing
+            steps = await self._get_workflow_steps(workflow)
+            first_step = steps[0] if steps else None
+
             if not first_step:
-                execution.status = 'failed'
-                execution.error_log = 'No steps defined in workflow'
+                # Record the failed execution with a single INSERT
+                execution = WorkflowExecution(
+                    document=document,
+                    workflow=workflow,
+                    status='failed',
+                    started_by=started_by,
+                    error_log='No steps defined in workflow',
+                    execution_data={
+                        'steps_completed': 0,
+                        'total_steps': 0
+                    }
+                )
                 await execution.asave()
                 return {
                     "status": "failed",
@@ -69,20 +188,40 @@ class AdvancedWorkflowService:
                     "workflow_id": str(workflow.id),
                     "workflow_name": workflow.name
                 }
-            
-            # Update execution with current step
-            execution.current_step = first_step
-            execution.status = 'in_progress'
+
+            # Create the execution record fully formed - status, current
+            # step and bookkeeping all ride on one INSERT instead of an
+            # INSERT followed by two UPDATEs
+            execution = WorkflowExecution(
+                document=document,
+                workflow=workflow,
+                status='in_progress',
+                started_by=started_by,
+                current_step=first_step,
+                execution_data={
+                    'steps_completed': 0,
+                    'total_steps': len(steps)
+                }
+            )
             await execution.asave()
+
+            # Hand the already-fetched step list to the advancement loop
+            # so step transitions index it instead of re-querying
+            execution._cached_steps = steps
             
             # Execute the first step
             result = await self._execute_workflow_step(execution, first_step)
             
-            # Store execution in active workflows for monitoring
+            # Track only ids for monitoring: pinning the live execution
+            # (and its document/workflow instances) would grow process
+            # memory for as long as the worker runs
+            self._evict_stale_workflows()
             self.active_workflows[str(execution.id)] = {
-                'execution': execution,
-                'last_activity': timezone.now(),
-                'notifications_sent': []
+                'document_id': str(document.id),
+                'workflow_id': str(workflow.id),
+                'current_step_id': str(first_step.id),
+                'last_activity_ts': time.monotonic(),
+                'notifications_sent': 0
             }
             
             return {
@@ -104,6 +243,30 @@ class AdvancedWorkflowService:
                 "workflow_name": workflow.name
             }
     
+    def _evict_stale_workflows(self):
+        """
+        Drop monitoring entries idle longer than the approval timeout
+        """
+        cutoff = time.monotonic() - self.approval_timeout
+        stale = [
+            execution_id for execution_id, entry in self.active_workflows.items()
+            if entry['last_activity_ts'] < cutoff
+        ]
+        for execution_id in stale:
+            del self.active_workflows[execution_id]
+
+    async def _get_workflow_steps(self, workflow):
+        """
+        Return the ordered step list for a workflow, cached per process
+        """
+        cached = self._step_cache.get(workflow.id)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        steps = [step async for step in workflow.steps.order_by('step_order')]
+        self._step_cache[workflow.id] = (time.monotonic() + _STEP_CACHE_TTL, steps)
+        return steps
+
     async def _check_approval_required(self, document, workflow):
         """
         Check if document requires approval based on workflow criteria
@@ -124,51 +287,61 @@ class AdvancedWorkflowService:
         
         return True
     
+    def _get_flat_fields(self, document):
+        """
+        Return the document's flattened field map, computed once per
+        instance so repeated threshold and condition checks skip the
+        nested dict walk
+        """
+        flat = getattr(document, '_flat_fields', None)
+        if flat is None:
+            flat = _flatten_fields(document.extracted_data or {})
+            document._flat_fields = flat
+        return flat
+
     async def _extract_document_amount(self, document):
         """
         Extract monetary amount from document for approval threshold check
         """
         if not document.extracted_data:
             return None
-        
-        # Look for common amount fields
-        amount_fields = ['total', 'amount', 'total_amount', 'grand_total', 'subtotal']
-        for field in amount_fields:
-            if field in document.extracted_data:
-                field_data = document.extracted_data[field]
-                if isinstance(field_data, dict) and 'value' in field_data:
-                    try:
-                        return float(field_data['value'])
-                    except (ValueError, TypeError):
-                        continue
-                elif isinstance(field_data, (int, float)):
-                    return float(field_data)
-        
+
+        flat = self._get_flat_fields(document)
+        for field in _AMOUNT_FIELDS:
+            value = flat.get(field)
+            if value is None:
+                continue
+            try:
+                return float(value)
+            except (ValueError, TypeError):
+                continue
+
         return None
     
     async def _auto_approve_document(self, document, workflow):
         """
         Auto-approve document when it meets auto-approval criteria
         """
-        from ..models import WorkflowExecution
         
         # Create completed execution
         execution = WorkflowExecution(
             document=document,
             workflow=workflow,
             status='completed',
+            completed_at=timezone.now(),
             execution_data={
                 'auto_approved': True,
-                'auto_approval_reason': 'Below threshold amount',
-                'completed_at': timezone.now().isoformat()
+                'auto_approval_reason': 'Below threshold amount'
             }
         )
-        await execution.asave()
-        
-        # Update document status
+        # Record the execution and flip the document status concurrently;
+        # the document write touches only its status column
         document.workflow_status = 'approved'
-        await document.asave()
-        
+        await asyncio.gather(
+            execution.asave(),
+            document.asave(update_fields=['workflow_status'])
+        )
+
         return {
             "status": "auto_approved",
             "execution_id": str(execution.id),
@@ -182,30 +355,25 @@ class AdvancedWorkflowService:
         Execute a specific workflow step
         """
         try:
-            # Update execution data
+            # Update execution data; step timing lives in its own column
+            # so saves do not rewrite the JSON blob per transition
             execution.execution_data['current_step'] = step.name
-            execution.execution_data['step_start_time'] = timezone.now().isoformat()
-            await execution.asave()
+            execution.step_started_at = timezone.now()
+            await execution.asave(update_fields=['execution_data', 'step_started_at'])
             
             # Check step conditions
             if not await self._check_step_conditions(execution.document, step):
                 return await self._skip_step(execution, step)
             
             # Execute step based on type
-            if step.step_type == 'approval':
-                return await self._execute_approval_step(execution, step)
-            elif step.step_type == 'integration':
-                return await self._execute_integration_step(execution, step)
-            elif step.step_type == 'notification':
-                return await self._execute_notification_step(execution, step)
-            else:  # processing
-                return await self._execute_processing_step(execution, step)
+            handler = self.step_handlers.get(step.step_type, self._execute_processing_step)
+            return await handler(execution, step)
                 
         except Exception as e:
             logger.error(f"Error executing step {step.name}: {str(e)}")
             execution.error_log = str(e)
             execution.status = 'failed'
-            await execution.asave()
+            await execution.asave(update_fields=['status', 'error_log'])
             return {"status": "failed", "error": str(e)}
     
     async def _check_step_conditions(self, document, step):
@@ -221,25 +389,10 @@ class AdvancedWorkflowService:
             return False
         
         # Check condition
-        condition_value = step.condition_value
-        operator = step.condition_operator
-        
-        if operator == 'eq':
-            return str(field_value) == str(condition_value)
-        elif operator == 'gt':
-            try:
-                return float(field_value) > float(condition_value)
-            except (ValueError, TypeError):
-                return False
-        elif operator == 'lt':
-            try:
-                return float(field_value) < float(condition_value)
-            except (ValueError, TypeError):
-                return False
-        elif operator == 'contains':
-            return str(condition_value).lower() in str(field_value).lower()
-        
-        return False
+        handler = _CONDITION_OPS.get(step.condition_operator)
+        if handler is None:
+            return False
+        return handler(field_value, step.condition_value)
     
     async def _get_document_field_value(self, document, field_name):
         """
@@ -247,32 +400,25 @@ class AdvancedWorkflowService:
         """
         if not document.extracted_data:
             return None
-        
-        # Handle nested field names
-        if '.' in field_name:
-            keys = field_name.split('.')
-            value = document.extracted_data
-            for key in keys:
-                if isinstance(value, dict) and key in value:
-                    value = value[key]
-                else:
-                    return None
-        else:
-            value = document.extracted_data.get(field_name)
-        
-        # Extract value from confidence structure
-        if isinstance(value, dict) and 'value' in value:
-            return value['value']
-        
-        return value
+
+        # Dot-path and confidence-structure handling happens once in the
+        # flattened map; lookups after that are plain dict gets
+        return self._get_flat_fields(document).get(field_name)
     
+    async def _partial_update(self, execution, **fields):
+        """
+        Persist specific columns with a direct UPDATE, skipping the full
+        model save machinery
+        """
+        await type(execution).objects.filter(pk=execution.pk).aupdate(**fields)
+
     async def _skip_step(self, execution, step):
         """
         Skip a step that doesn't meet conditions
         """
         execution.execution_data['steps_skipped'] = execution.execution_data.get('steps_skipped', 0) + 1
         execution.execution_data['skip_reason'] = f"Step {step.name} conditions not met"
-        await execution.asave()
+        await self._partial_update(execution, execution_data=execution.execution_data)
         
         # Move to next step
         return await self._move_to_next_step(execution)
@@ -281,11 +427,15 @@ class AdvancedWorkflowService:
         """
         Execute approval step with multi-level routing
         """
-        from ..models import DocumentApproval
         
         # Determine approval level
         approval_level = execution.execution_data.get('current_approval_level', 1)
-        
+
+        # Steps that need every group member create all approvals at once
+        # and fan the notifications out concurrently
+        if step.approval_group and step.requires_all_approvers:
+            return await self._execute_group_approval_step(execution, step, approval_level)
+
         # Create approval record
         approval = DocumentApproval(
             document=execution.document,
@@ -320,7 +470,7 @@ class AdvancedWorkflowService:
         # Update execution data
         execution.execution_data['pending_approvals'] = execution.execution_data.get('pending_approvals', [])
         execution.execution_data['pending_approvals'].append(str(approval.id))
-        await execution.asave()
+        await execution.asave(update_fields=['execution_data'])
         
         return {
             "status": "approval_pending",
@@ -328,62 +478,116 @@ class AdvancedWorkflowService:
             "approver": approval.approver.username,
             "due_date": approval.due_date.isoformat()
         }
-    
+
+    async def _execute_group_approval_step(self, execution, step, approval_level):
+        """
+        Create approvals for every member of the step's approval group
+        """
+        approvers = [
+            user async for user in User.objects.filter(groups__name=step.approval_group)
+        ]
+        if not approvers:
+            return {"status": "failed", "error": "No approver found in group"}
+
+        due_date = timezone.now() + timedelta(hours=24)
+        approvals = await DocumentApproval.objects.abulk_create([
+            DocumentApproval(
+                document=execution.document,
+                workflow_step=step,
+                approval_level=approval_level,
+                approver=approver,
+                due_date=due_date
+            )
+            for approver in approvers
+        ])
+
+        # Update document status
+        execution.document.workflow_status = 'pending'
+        execution.document.current_approver = approvers[0]
+        await execution.document.asave()
+
+        # Notify every approver in parallel
+        await asyncio.gather(*(
+            self._send_approval_notification(approval) for approval in approvals
+        ))
+
+        # Update execution data
+        pending = execution.execution_data.get('pending_approvals', [])
+        pending.extend(str(approval.id) for approval in approvals)
+        execution.execution_data['pending_approvals'] = pending
+        await execution.asave(update_fields=['execution_data'])
+
+        return {
+            "status": "approval_pending",
+            "approval_ids": [str(approval.id) for approval in approvals],
+            "approvers": [approver.username for approver in approvers],
+            "due_date": due_date.isoformat()
+        }
+
     async def _get_approver_from_group(self, group_name, level):
         """
         Get approver from approval group based on level
         """
         # This is a simplified implementation
         # In a real system, you'd have proper group management
+        cached = self._group_cache.get((group_name, level))
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
         try:
-            # Get users from group (simplified)
-            users = User.objects.filter(groups__name=group_name)
-            if level == 1:
-                return await users.afirst()
-            else:
-                # For higher levels, get different approvers
-                user_list = [user async for user in users]
-                if len(user_list) >= level:
-                    return user_list[level - 1]
-                return user_list[-1] if user_list else None
+            # LIMIT 1 OFFSET level-1 instead of materializing the whole group
+            users = User.objects.filter(groups__name=group_name).order_by('id')
+            approver = await users[level - 1:level].afirst()
+            if approver is None:
+                # Level exceeds the group size - fall back to the last member
+                approver = await users.alast()
+            self._group_cache[(group_name, level)] = (time.monotonic() + _STEP_CACHE_TTL, approver)
+            return approver
         except Exception:
             return None
     
-    async def _execute_integration_step(self, execution, step):
+    async def _execute_integration_action(self, execution, step):
         """
-        Execute integration step
+        Execute an integration step's action without advancing the workflow
         """
-        from .integration_service import integration_service
-        from ..models import IntegrationConfiguration
-        
+
         if not step.integration_system:
-            return {"status": "failed", "error": "No integration system specified"}
-        
+            return {"status": "failed", "step": step.name, "error": "No integration system specified"}
+
         try:
             # Get integration configuration
             integration_config = await IntegrationConfiguration.objects.aget(
                 integration_type=step.integration_system,
                 status='active'
             )
-            
+
             # Execute integration
             result = await integration_service.send_to_external_system(
                 execution.document,
                 integration_config
             )
-            
+
             # Update execution data
             execution.execution_data['integration_results'] = execution.execution_data.get('integration_results', [])
             execution.execution_data['integration_results'].append(result)
-            await execution.asave()
-            
+            await execution.asave(update_fields=['execution_data'])
+
             if result.get('status') == 'success':
-                return await self._move_to_next_step(execution)
+                return {"status": "completed", "step": step.name}
             else:
-                return {"status": "failed", "error": result.get('error', 'Integration failed')}
-                
+                return {"status": "failed", "step": step.name, "error": result.get('error', 'Integration failed')}
+
         except Exception as e:
-            return {"status": "failed", "error": str(e)}
+            return {"status": "failed", "step": step.name, "error": str(e)}
+
+    async def _execute_integration_step(self, execution, step):
+        """
+        Execute integration step
+        """
+        result = await self._execute_integration_action(execution, step)
+        if result.get('status') == 'completed':
+            return await self._move_to_next_step(execution)
+        return {"status": "failed", "error": result.get('error', 'Integration failed')}
     
     async def _execute_notification_step(self, execution, step):
         """
@@ -406,76 +610,149 @@ class AdvancedWorkflowService:
         # Default processing step - just move to next step
         return await self._move_to_next_step(execution)
     
+    async def _execute_step_action(self, execution, step):
+        """
+        Run a single step's action without advancing the workflow, so
+        independent steps in a parallel group can be gathered safely
+        """
+        try:
+            if not await self._check_step_conditions(execution.document, step):
+                return {"status": "skipped", "step": step.name}
+
+            if step.step_type == 'approval':
+                return await self._execute_approval_step(execution, step)
+            elif step.step_type == 'integration':
+                return await self._execute_integration_action(execution, step)
+            elif step.step_type == 'notification':
+                await self._send_workflow_notification(
+                    execution.document,
+                    f"Workflow {execution.workflow.name} - {step.name}",
+                    step.description,
+                    execution.workflow
+                )
+                return {"status": "completed", "step": step.name}
+            else:  # processing
+                return {"status": "completed", "step": step.name}
+        except Exception as e:
+            logger.error(f"Error executing step {step.name}: {str(e)}")
+            return {"status": "failed", "step": step.name, "error": str(e)}
+
     async def _move_to_next_step(self, execution):
         """
-        Move workflow to next step
+        Advance the workflow until it suspends or completes
+
+        Runs as a loop rather than recursing per step, so long chains of
+        processing/notification steps neither grow the coroutine stack
+        nor issue redundant saves. Steps sharing the same step_order are
+        treated as independent branches and executed concurrently.
         """
-        current_step = execution.current_step
-        next_step = await execution.workflow.steps.filter(
-            step_order=current_step.step_order + 1
-        ).afirst()
-        
-        if next_step:
-            execution.current_step = next_step
-            execution.execution_data['steps_completed'] = execution.execution_data.get('steps_completed', 0) + 1
-            await execution.asave()
-            
-            # Execute next step
-            return await self._execute_workflow_step(execution, next_step)
-        else:
-            # Workflow completed
-            execution.status = 'completed'
-            execution.completed_at = timezone.now()
-            execution.execution_data['completed_at'] = timezone.now().isoformat()
-            await execution.asave()
-            
-            # Update document status
-            execution.document.workflow_status = 'approved'
-            execution.document.current_approver = None
-            await execution.document.asave()
-            
-            return {"status": "completed", "message": "Workflow completed successfully"}
+        while True:
+            current_step = execution.current_step
+            cached_steps = getattr(execution, '_cached_steps', None)
+            if cached_steps is not None:
+                next_steps = [
+                    step for step in cached_steps
+                    if step.step_order == current_step.step_order + 1
+                ]
+            else:
+                next_steps = [
+                    step async for step in execution.workflow.steps.filter(
+                        step_order=current_step.step_order + 1
+                    )
+                ]
+
+            if not next_steps:
+                # Workflow completed - completed_at column is the record
+                execution.status = 'completed'
+                execution.completed_at = timezone.now()
+                await execution.asave(update_fields=['status', 'completed_at', 'execution_data'])
+
+                # Update document status
+                execution.document.workflow_status = 'approved'
+                execution.document.current_approver = None
+                await execution.document.asave()
+
+                return {"status": "completed", "message": "Workflow completed successfully"}
+
+            # One save covers the step pointer, bookkeeping and timing data
+            execution.current_step = next_steps[0]
+            execution.execution_data['current_step'] = next_steps[0].name
+            execution.execution_data['steps_completed'] = execution.execution_data.get('steps_completed', 0) + len(next_steps)
+            execution.step_started_at = timezone.now()
+            await execution.asave(update_fields=['current_step', 'execution_data', 'step_started_at'])
+
+            if len(next_steps) == 1:
+                results = [await self._execute_step_action(execution, next_steps[0])]
+            else:
+                # Parallel group: run all branches of this step_order together
+                results = await asyncio.gather(*(
+                    self._execute_step_action(execution, step) for step in next_steps
+                ))
+
+            failed = [r for r in results if r.get('status') == 'failed']
+            if failed:
+                execution.status = 'failed'
+                execution.error_log = '; '.join(r.get('error', r['step']) for r in failed)
+                await execution.asave(update_fields=['status', 'error_log'])
+                return {"status": "failed", "step_results": results}
+
+            pending = [r for r in results if r.get('status') == 'approval_pending']
+            if pending:
+                if len(results) == 1:
+                    return results[0]
+                return {"status": "approval_pending", "step_results": results}
+
+            skipped = sum(1 for r in results if r.get('status') == 'skipped')
+            if skipped:
+                # Persisted by the next iteration's save (or on completion)
+                execution.execution_data['steps_skipped'] = execution.execution_data.get('steps_skipped', 0) + skipped
+
+            # Every branch completed or was skipped - advance past the group
     
     async def continue_workflow(self, execution):
         """
         Continue workflow execution after approval or other pause
         """
         try:
-            print(f"🔄 Continuing workflow for execution {execution.id}")
-            
+            logger.debug("Continuing workflow for execution %s", execution.id)
+
             # Move to next step
             result = await self._move_to_next_step(execution)
-            
-            print(f"✅ Workflow continuation result: {result}")
+
+            logger.debug("Workflow continuation result: %s", result)
             return result
-            
+
         except Exception as e:
-            print(f"❌ Error continuing workflow: {str(e)}")
+            logger.exception("Error continuing workflow for execution %s", execution.id)
             execution.status = 'failed'
             execution.error_log = f"Error continuing workflow: {str(e)}"
-            await execution.asave()
+            await execution.asave(update_fields=['status', 'error_log'])
             return {"status": "failed", "error": str(e)}
     
     async def handle_approval_response(self, approval_id, approver, action, comments=None):
         """
         Handle approval response (approve/reject/delegate)
         """
-        from ..models import DocumentApproval
         
         try:
-            approval = await DocumentApproval.objects.aget(id=approval_id)
-            
+            # Eager-load the relations touched below so the checks and the
+            # follow-up handlers never lazy-load on the async path
+            approval = await DocumentApproval.objects.select_related(
+                'approver', 'workflow_step', 'document'
+            ).aget(id=approval_id)
+
             if approval.approver != approver:
                 return {"status": "error", "error": "Unauthorized approver"}
-            
-            # Update approval
+
+            # Update approval - write only the columns that changed, and
+            # overlap the save with the independent execution fetch
             approval.status = action
             approval.comments = comments or ""
             approval.reviewed_at = timezone.now()
-            await approval.asave()
-            
-            # Get workflow execution
-            execution = await approval.document.workflow_executions.afirst()
+            _, execution = await asyncio.gather(
+                approval.asave(update_fields=['status', 'comments', 'reviewed_at']),
+                approval.document.workflow_executions.afirst()
+            )
             
             if action == 'approved':
                 return await self._handle_approval_approved(approval, execution)
@@ -514,7 +791,12 @@ class AdvancedWorkflowService:
         execution.status = 'failed'
         execution.error_log = f"Rejected by {approval.approver.username}: {approval.comments}"
         execution.completed_at = timezone.now()
-        await execution.asave()
+        await self._partial_update(
+            execution,
+            status=execution.status,
+            error_log=execution.error_log,
+            completed_at=execution.completed_at
+        )
         
         # Update document status
         execution.document.workflow_status = 'rejected'
@@ -558,7 +840,6 @@ class AdvancedWorkflowService:
         """
         Send workflow notification
         """
-        from ..models import Notification
         
         # Create notification record
         notification = Notification(
@@ -568,32 +849,27 @@ class AdvancedWorkflowService:
             document=document,
             workflow=workflow
         )
+
+        # Persist the record as 'pending' first; the mail worker flips
+        # the row to 'sent' or 'failed' once delivery has been attempted
         await notification.asave()
-        
-        # Send email
         await self._send_email_notification(
             notification.recipient_email,
             subject,
-            message
+            message,
+            notification_id=notification.id
         )
-    
-    async def _send_email_notification(self, recipient_email, subject, message):
+
+    async def _send_email_notification(self, recipient_email, subject, message, notification_id=None):
         """
-        Send email notification
+        Queue an email notification on the shared mail pool
+
+        Returns as soon as the message is enqueued. When a notification_id
+        is given, the worker records the delivery outcome on that row;
+        otherwise failures are only logged.
         """
-        try:
-            # Use Django's email functionality
-            await sync_to_async(send_mail)(
-                subject,
-                message,
-                settings.DEFAULT_FROM_EMAIL,
-                [recipient_email],
-                fail_silently=False
-            )
-            return True
-        except Exception as e:
-            logger.error(f"Failed to send email to {recipient_email}: {str(e)}")
-            return False
+        _MAIL_POOL.submit(_send_mail_sync, recipient_email, subject, message, notification_id)
+        return True
 
 
 # Global service instance
@@ -613,36 +889,60 @@ async def send_email_notification(notification):
     Send an email notification
     """
     try:
+        # The mail worker records the delivery outcome on the row, so
+        # don't mark the notification 'sent' before it has gone out
+        notification.sent_status = "pending"
+        await notification.asave(update_fields=['sent_status'])
+
         await workflow_service._send_email_notification(
             notification.recipient_email,
             notification.subject,
-            notification.message
+            notification.message,
+            notification_id=notification.id
         )
-        
-        notification.sent_status = "sent"
-        notification.sent_at = timezone.now()
-        await notification.asave()
-        
+
         return True
     except Exception as e:
         logger.error(f"Error sending notification: {str(e)}")
-        
+
         notification.sent_status = "failed"
         await notification.asave()
-        
+
         return False
 
 
+# Workflow rows are reused across many documents; cache them briefly so
+# batch processing pays one fetch per workflow instead of one per document
+_WORKFLOW_CACHE_TTL = 30  # seconds
+_workflow_cache = {}
+
+
+async def _get_workflow(workflow_id):
+    """
+    Fetch a Workflow by id through the short-lived cache
+    """
+    key = str(workflow_id)
+    cached = _workflow_cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    workflow = await Workflow.objects.aget(id=workflow_id)
+    _workflow_cache[key] = (time.monotonic() + _WORKFLOW_CACHE_TTL, workflow)
+    return workflow
+
+
 async def process_document_in_workflow(document_id, workflow_id, started_by=None):
     """
     Process a document through a workflow
     """
-    from ..models import Document, Workflow
-    
+
     try:
-        document = await Document.objects.aget(id=document_id)
-        workflow = await Workflow.objects.aget(id=workflow_id)
-        
+        # Fetch both records concurrently instead of paying two sequential round-trips
+        document, workflow = await asyncio.gather(
+            Document.objects.aget(id=document_id),
+            _get_workflow(workflow_id)
+        )
+
         return await workflow_service.start_document_workflow(document, workflow, started_by)
     except Document.DoesNotExist:
         return {
@@ -661,16 +961,82 @@ async def process_document_in_workflow(document_id, workflow_id, started_by=None
         }
 
 
+async def process_documents_in_workflow(document_ids, workflow_id, started_by=None, max_concurrency=10):
+    """
+    Process a batch of documents through the same workflow concurrently
+
+    The workflow is fetched once and shared across the batch; a semaphore
+    bounds how many documents are in flight at a time.
+    """
+
+    try:
+        workflow = await Workflow.objects.aget(id=workflow_id)
+    except Workflow.DoesNotExist:
+        return [
+            {"status": "failed", "error": f"Workflow with ID {workflow_id} not found"}
+            for _ in document_ids
+        ]
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _process_one(document_id):
+        async with semaphore:
+            try:
+                document = await Document.objects.aget(id=document_id)
+            except Document.DoesNotExist:
+                return {
+                    "status": "failed",
+                    "error": f"Document with ID {document_id} not found"
+                }
+            return await workflow_service.start_document_workflow(document, workflow, started_by)
+
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(_process_one(document_id)) for document_id in document_ids]
+
+    return [task.result() for task in tasks]
+
+
+# Cached template listing: (expires_at, version, payload). The version is
+# bumped by create_workflow so new workflows appear immediately.
+_TEMPLATES_CACHE_TTL = 60  # seconds
+_templates_cache = None
+_templates_version = 0
+_templates_lock = asyncio.Lock()
+
+
 async def get_workflow_templates():
     """
     Get all available workflow templates
     """
-    from ..models import Workflow
-    
+    global _templates_cache
+
+    cached = _templates_cache
+    if cached and cached[0] > time.monotonic() and cached[1] == _templates_version:
+        return cached[2]
+
+    async with _templates_lock:
+        # Another request may have refreshed the cache while we waited
+        cached = _templates_cache
+        if cached and cached[0] > time.monotonic() and cached[1] == _templates_version:
+            return cached[2]
+
+        workflows = await _fetch_workflow_templates()
+        _templates_cache = (time.monotonic() + _TEMPLATES_CACHE_TTL, _templates_version, workflows)
+        return workflows
+
+
+async def _fetch_workflow_templates():
+    """
+    Build the JSON-ready template list from the database
+    """
+
     workflows = []
-    async for workflow in Workflow.objects.filter(is_active=True):
+    queryset = Workflow.objects.filter(is_active=True).prefetch_related(
+        Prefetch('steps', queryset=WorkflowStep.objects.select_related('approver').order_by('step_order'))
+    )
+    async for workflow in queryset:
         steps = []
-        async for step in workflow.steps.all():
+        for step in workflow.steps.all():
             steps.append({
                 "id": str(step.id),
                 "name": step.name,
@@ -694,39 +1060,59 @@ async def get_workflow_templates():
     return workflows
 
 
+def _create_workflow_sync(name, description, steps, requires_approval, approval_threshold):
+    """
+    Create a workflow and its steps atomically
+
+    Runs synchronously so the whole creation commits (or rolls back) as
+    one transaction; async ORM calls cannot span transaction.atomic.
+    """
+    with transaction.atomic():
+        workflow = Workflow(
+            name=name,
+            description=description,
+            requires_approval=requires_approval,
+            approval_threshold=approval_threshold
+        )
+        workflow.save()
+
+        # Create the steps in a single INSERT instead of one round-trip per step
+        WorkflowStep.objects.bulk_create(
+            [
+                WorkflowStep(
+                    workflow=workflow,
+                    name=step["name"],
+                    description=step["description"],
+                    step_order=step["step_order"],
+                    step_type=step.get("step_type", "processing"),
+                    approval_group=step.get("approval_group"),
+                    requires_all_approvers=step.get("requires_all_approvers", False),
+                    integration_system=step.get("integration_system"),
+                    integration_config=step.get("integration_config"),
+                    condition_field=step.get("condition_field"),
+                    condition_value=step.get("condition_value"),
+                    condition_operator=step.get("condition_operator")
+                )
+                for step in steps
+            ],
+            batch_size=500
+        )
+
+    return workflow
+
+
 async def create_workflow(name, description, steps, requires_approval=False, approval_threshold=None):
     """
     Create a new workflow with the specified steps
     """
-    from ..models import Workflow, WorkflowStep
-    
-    # Create the workflow
-    workflow = Workflow(
-        name=name,
-        description=description,
-        requires_approval=requires_approval,
-        approval_threshold=approval_threshold
+    workflow = await sync_to_async(_create_workflow_sync)(
+        name, description, steps, requires_approval, approval_threshold
     )
-    await workflow.asave()
-    
-    # Create the steps
-    for step in steps:
-        workflow_step = WorkflowStep(
-            workflow=workflow,
-            name=step["name"],
-            description=step["description"],
-            step_order=step["step_order"],
-            step_type=step.get("step_type", "processing"),
-            approval_group=step.get("approval_group"),
-            requires_all_approvers=step.get("requires_all_approvers", False),
-            integration_system=step.get("integration_system"),
-            integration_config=step.get("integration_config"),
-            condition_field=step.get("condition_field"),
-            condition_value=step.get("condition_value"),
-            condition_operator=step.get("condition_operator")
-        )
-        await workflow_step.asave()
-        
+
+    # Invalidate the cached template listing so the new workflow shows up
+    global _templates_version
+    _templates_version += 1
+
     return workflow
 
 
@@ -734,18 +1120,15 @@ async def send_workflow_notification(recipient_email, subject, message, document
     """
     Send a notification about a workflow
     """
-    from ..models import Notification, Document, Workflow
     
     try:
-        document = None
-        workflow = None
-        
-        if document_id:
-            document = await Document.objects.aget(id=document_id)
-            
-        if workflow_id:
-            workflow = await Workflow.objects.aget(id=workflow_id)
-            
+        # asyncio.sleep(0) resolves to None for whichever ID is missing,
+        # so both lookups still run in a single concurrent gather
+        document, workflow = await asyncio.gather(
+            Document.objects.aget(id=document_id) if document_id else asyncio.sleep(0),
+            Workflow.objects.aget(id=workflow_id) if workflow_id else asyncio.sleep(0)
+        )
+
         notification = Notification(
             recipient_email=recipient_email,
             subject=subject,
@@ -753,9 +1136,18 @@ async def send_workflow_notification(recipient_email, subject, message, document
             document=document,
             workflow=workflow
         )
+
+        # Persist the record as 'pending' first; the mail worker flips
+        # the row to 'sent' or 'failed' once delivery has been attempted
         await notification.asave()
-        
-        return await send_email_notification(notification)
+        await workflow_service._send_email_notification(
+            recipient_email,
+            subject,
+            message,
+            notification_id=notification.id
+        )
+
+        return True
     except Exception as e:
         logger.error(f"Error sending workflow notification: {str(e)}")
         return False 
\ No newline at end of file